@@ -17,45 +17,185 @@ FEATURE_COLUMNS = [
     "навантаження_мвт", "потужність_мвт", "завантаженість",
     "температура_с", "вітер_м_с", "свято", "вік_років"
 ]
+LOAD_COL_IDX = FEATURE_COLUMNS.index("навантаження_мвт")
+GROUP_LABELS = np.array(["Низьке", "Середнє", "Високе"])
 
 def ensure_columns(df, required_cols):
     missing = [c for c in required_cols if c not in df.columns]
     if missing:
         raise ValueError(f"У CSV відсутні колонки: {missing}\nЄ колонки: {df.columns.tolist()}")
 
-def train_cox_model(df):
-
-    if df[EVENT_COL].dtype == object:
-        df[EVENT_COL] = df[EVENT_COL].astype(int)
-    cph = CoxPHFitter()
-    cph.fit(df[[DURATION_COL, EVENT_COL] + FEATURE_COLUMNS],
-            duration_col=DURATION_COL, event_col=EVENT_COL)
+def feature_matrix(df):
+    return np.ascontiguousarray(df[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+
+def train_cox_model(df, features=None):
+
+    if features is None:
+        features = feature_matrix(df)
+    events = df[EVENT_COL]
+    # Цілі/булеві події (як у generate_random_data) передаються без приведення
+    if events.dtype.kind not in "iub":
+        events = events.astype(np.int8)
+    # Кадр для fit будується навколо спільної матриці ознак, без df.copy()
+    sub = pd.DataFrame(features, columns=FEATURE_COLUMNS, copy=False)
+    sub.insert(0, DURATION_COL, df[DURATION_COL].to_numpy())
+    sub.insert(1, EVENT_COL, events.to_numpy())
+    cph = CoxPHFitter(penalizer=0.0)
+    # Пакетний алгоритм швидший для малого n; HR у звіті показуються з 2 знаками,
+    # тож точність Ньютона 1e-6 замість 1e-7 нічого не змінює у відображенні
+    cph.fit(sub,
+            duration_col=DURATION_COL, event_col=EVENT_COL,
+            batch_mode=True, show_progress=False,
+            fit_options={"precision": 1e-6})
     return cph
 
-def generate_random_data(n=120):
-    rng = np.random.default_rng()
-    df = pd.DataFrame({
-        "ід": np.arange(1, n+1),
-        DURATION_COL: rng.integers(10, 200, size=n),
-        EVENT_COL: rng.integers(0, 2, size=n),
-        "навантаження_мвт": rng.uniform(3000, 6000, size=n),
-        "потужність_мвт": rng.uniform(4000, 7000, size=n),
-        "завантаженість": rng.uniform(0.5, 0.9, size=n),
-        "температура_с": rng.uniform(-20, 35, size=n),
-        "вітер_м_с": rng.uniform(0, 15, size=n),
-        "свято": rng.integers(0, 2, size=n),
-        "вік_років": rng.integers(1, 50, size=n)
-    })
+def infer_types_by_power(power):
+    return np.select([power > 6000, power > 5200],
+                     ["Генератор", "Підстанція"], default="Лінія")
+
+def format_report_body(sorted_summary):
+    report_lines = ["📊 Звіт моніторингу завантаженості (модель Кокса)\n"]
+    for feature, row_sum in sorted_summary.iterrows():
+        hr_val = row_sum["exp(coef)"]
+        ci_low = row_sum["exp(coef) lower 95%"]
+        ci_high = row_sum["exp(coef) upper 95%"]
+        percent = (hr_val - 1) * 100
+        if hr_val > 1.1:
+            effect = f"підвищує ризик приблизно на {percent:.1f}%"
+        elif hr_val < 0.9:
+            effect = f"знижує ризик приблизно на {abs(percent):.1f}%"
+        else:
+            effect = "майже не впливає на ризик"
+        report_lines.append(
+            f"• {feature}: {effect} (HR={hr_val:.2f}, CI {ci_low:.2f}–{ci_high:.2f})"
+        )
+    report_lines.append(f"\nНайбільший вплив має: {sorted_summary.index[0]}\n")
+    return "\n".join(report_lines)
+
+def element_names(ids):
+    return np.char.add("Елемент-", ids.astype(str))
+
+def summarize_cox_model(cph):
+    # Усе, що залежить лише від навченої моделі, рахується один раз після fit
+    summary = cph.summary
+    if summary.empty:
+        return summary, None, [], ""
+    hr = summary["exp(coef)"].sort_values()
+    colors = ["red" if v > 1 else "green" for v in hr.values]
+    sorted_summary = summary.reindex(
+        summary["exp(coef)"].sub(1).abs().sort_values(ascending=False).index
+    )
+    return summary, hr, colors, format_report_body(sorted_summary)
+
+def predict_element(cph, row):
+    # Прогнози для одного рядка як звичайні масиви numpy (для кешу по індексу)
+    surv = cph.predict_survival_function(row)
+    ch = cph.predict_cumulative_hazard(row)
+    risk_score = float(cph.predict_partial_hazard(row).values[0])
+    surv_t, yvals = surv.index.to_numpy(), surv.values.flatten()
+    # Крива виживання не зростає, тож -yvals відсортований: перший вузол із S(t) <= 0.5
+    t_idx = np.searchsorted(-yvals, -0.5)
+    t50 = surv_t[t_idx] if t_idx < len(yvals) else None
+    return (surv_t, yvals, ch.index.to_numpy(), ch.values.flatten(),
+            risk_score, t50)
+
+def km_group_curves(df, var):
+    values = df[var]
+    if pd.api.types.is_numeric_dtype(values) and values.nunique() > 3:
+        # Терцилі як у pd.qcut: інтервали (min, q1], (q1, q2], (q2, max]
+        arr = values.to_numpy(dtype=np.float64)
+        edges = np.quantile(arr, [1/3, 2/3])
+        groups = GROUP_LABELS[np.digitize(arr, edges, right=True)]
+    else:
+        groups = values.astype(str).to_numpy()
+
+    durations = df[DURATION_COL].to_numpy()
+    events = df[EVENT_COL].to_numpy()
+    kmf = KaplanMeierFitter()
+    curves = []
+    for val in np.unique(groups):
+        mask = groups == val
+        kmf.fit(durations[mask], event_observed=events[mask])
+        sf = kmf.survival_function_
+        curves.append((f"{var}={val}", sf.index.to_numpy(), sf.values.flatten()))
+    return curves
+
+def make_blitter(canvas, get_artists):
+    # Фон (без анімованих артистів) знімається після кожного повного рендеру
+    fig = canvas.figure
+    background = None
+
+    def draw_animated():
+        for artist in get_artists():
+            if artist is not None:
+                fig.draw_artist(artist)
+
+    def on_draw(event):
+        nonlocal background
+        background = canvas.copy_from_bbox(fig.bbox)
+        draw_animated()
+
+    def blit():
+        if background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(background)
+        draw_animated()
+        canvas.blit(fig.bbox)
+
+    canvas.mpl_connect("draw_event", on_draw)
+    return blit
+
+def refresh_axes(canvas, ax, blit):
+    # Повний рендер потрібен лише тоді, коли змінились межі осей
+    limits = (ax.get_xlim(), ax.get_ylim())
+    ax.relim(visible_only=True)
+    ax.autoscale_view()
+    if (ax.get_xlim(), ax.get_ylim()) != limits:
+        canvas.draw_idle()
+    else:
+        blit()
+
+def apply_plot_theme():
+    sns.set_theme(style="whitegrid", palette="deep")
+
+    preferred_styles = ["seaborn-darkgrid", "seaborn-v0_8-darkgrid", "ggplot"]
+    for s in preferred_styles:
+        if s in plt.style.available:
+            plt.style.use(s)
+            break
 
-    df["назва"] = ["Елемент-" + str(i) for i in df["ід"]]
+    plt.rcParams.update({
+        "figure.dpi": 100,
+        "axes.titlesize": 12,
+        "axes.labelsize": 10,
+        "legend.fontsize": 9
+    })
 
-    def infer_type_by_power(p):
-        if p > 6000:
-            return "Генератор"
-        if p > 5200:
-            return "Підстанція"
-        return "Лінія"
-    df["тип"] = [infer_type_by_power(p) for p in df["потужність_мвт"]]
+def generate_random_data(n=120):
+    rng = np.random.default_rng()
+    ids = np.arange(1, n+1)
+    float_ranges = {
+        "навантаження_мвт": (3000, 6000),
+        "потужність_мвт": (4000, 7000),
+        "завантаженість": (0.5, 0.9),
+        "температура_с": (-20, 35),
+        "вітер_м_с": (0, 15),
+    }
+    # Дійсні ознаки — один F-масив: кожна колонка суцільна в пам'яті,
+    # і pandas бере його як єдиний блок без копіювання при консолідації
+    low, high = np.array(list(float_ranges.values()), dtype=np.float64).T
+    floats = np.asfortranarray(rng.uniform(low, high, size=(n, len(float_ranges))))
+    df = pd.DataFrame(floats, columns=list(float_ranges), copy=False)
+    df.insert(0, "ід", ids)
+    df.insert(1, DURATION_COL, rng.integers(10, 200, size=n))
+    df.insert(2, EVENT_COL, rng.integers(0, 2, size=n))
+    df["свято"] = rng.integers(0, 2, size=n)
+    df["вік_років"] = rng.integers(1, 50, size=n)
+    power = df["потужність_мвт"].to_numpy()
+
+    df["назва"] = element_names(ids)
+    df["тип"] = infer_types_by_power(power)
     return df
 
 def run_dashboard():
@@ -63,12 +203,14 @@ def run_dashboard():
     try:
         df = pd.read_csv("cox_energy_dataset.csv", encoding="utf-8-sig")
         ensure_columns(df, [DURATION_COL, EVENT_COL] + FEATURE_COLUMNS)
-        cph = train_cox_model(df.copy())
+        feature_arr = feature_matrix(df)
+        cph = train_cox_model(df, feature_arr)
         source_label = "cox_energy_dataset.csv"
     except Exception as e:
         # Фолбек на випадкові дані
         df = generate_random_data(120)
-        cph = train_cox_model(df.copy())
+        feature_arr = feature_matrix(df)
+        cph = train_cox_model(df, feature_arr)
         source_label = "випадкові дані"
         messagebox.showwarning(
             "⚠️ Дані — Система моніторингу",
@@ -76,20 +218,34 @@ def run_dashboard():
         )
 
     if "назва" not in df.columns:
-        df["назва"] = df["ід"].astype(str).apply(lambda x: f"Елемент-{x}")
+        df["назва"] = element_names(df["ід"].to_numpy())
     if "тип" not in df.columns:
+        # Нечислові значення потужності стають NaN і трактуються як "Лінія"
+        power = pd.to_numeric(df["потужність_мвт"], errors="coerce").to_numpy()
+        df["тип"] = infer_types_by_power(power)
+
+    summary, hr_sorted, hr_colors, report_body = summarize_cox_model(cph)
+    pred_cache = {}
+    km_cache = {}
+    load_min = load_max = None
+    id_list, id_to_idx = [], {}
+    # Один перевикористовуваний рядок для cph.predict_* замість df.iloc[[idx]]
+    row_df = pd.DataFrame(np.empty((1, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+
+    def refresh_df_cache():
+        # Похідні від df величини, що змінюються лише разом із набором даних
+        nonlocal load_min, load_max, id_list, id_to_idx
+        load_col = feature_arr[:, LOAD_COL_IDX]
+        load_min, load_max = float(load_col.min()), float(load_col.max())
+        if "ід" in df.columns:
+            id_list = [str(x) for x in df["ід"].to_numpy()]
+        else:
+            id_list = [str(i) for i in range(len(df))]
+        id_to_idx = {}
+        for i, id_str in enumerate(id_list):
+            id_to_idx.setdefault(id_str, i)
 
-        def infer_type_row(r):
-            try:
-                p = float(r.get("потужність_мвт", 0))
-                if p > 6000:
-                    return "Генератор"
-                if p > 5200:
-                    return "Підстанція"
-            except Exception:
-                pass
-            return "Лінія"
-        df["тип"] = df.apply(infer_type_row, axis=1)
+    refresh_df_cache()
 
     root = tk.Tk()
     root.title(f"Система моніторингу завантаженості енергосистеми — {source_label}")
@@ -110,20 +266,7 @@ def run_dashboard():
     style.configure("green.Horizontal.TProgressbar", troughcolor="#e6f4ea", background="#2a9d8f")
 
 
-    sns.set_theme(style="whitegrid", palette="deep")
-
-    preferred_styles = ["seaborn-darkgrid", "seaborn-v0_8-darkgrid", "ggplot"]
-    for s in preferred_styles:
-        if s in plt.style.available:
-            plt.style.use(s)
-            break
-
-    plt.rcParams.update({
-        "figure.dpi": 100,
-        "axes.titlesize": 12,
-        "axes.labelsize": 10,
-        "legend.fontsize": 9
-    })
+    apply_plot_theme()
 
     title = ttk.Label(root, text=f"Система моніторингу завантаженості енергосистеми ({source_label})",
                       style="Title.TLabel")
@@ -140,10 +283,6 @@ def run_dashboard():
     spin.pack(side=tk.LEFT, padx=5)
 
 
-    if "ід" in df.columns:
-        id_list = df["ід"].astype(str).tolist()
-    else:
-        id_list = [str(i) for i in range(len(df))]
     id_var = tk.StringVar(value=id_list[0] if id_list else "")
     id_menu = ttk.Combobox(top_frame, textvariable=id_var, values=id_list, state="readonly", width=10)
     id_menu.pack(side=tk.LEFT, padx=5)
@@ -151,10 +290,8 @@ def run_dashboard():
     def on_id_change(event=None):
 
         try:
-            sel = id_var.get()
-            idxs = df.index[df["ід"].astype(str) == sel].tolist() if "ід" in df.columns else []
-            if idxs:
-                spin_val = int(idxs[0])
+            spin_val = id_to_idx.get(id_var.get())
+            if spin_val is not None:
                 obj_var.set(spin_val)
         except Exception:
             pass
@@ -199,18 +336,48 @@ def run_dashboard():
     canvas_surv = FigureCanvasTkAgg(fig_surv, master=frame_surv)
     canvas_surv.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    ax_surv.set_xlabel("Час")
+    ax_surv.set_ylabel("Ймовірність")
+    ax_surv.set_ylim(0, 1.05)
+    ax_surv.title.set_animated(True)
+    surv_line, = ax_surv.plot([], [], linewidth=2, color="blue",
+                              label="Ймовірність виживання", animated=True)
+    median_vline = ax_surv.axvline(0, color="red", linestyle="--", animated=True)
+    median_vline.set_visible(False)
+    blit_surv = make_blitter(
+        canvas_surv,
+        lambda: [surv_line, median_vline, ax_surv.title, ax_surv.get_legend()]
+    )
+
     fig_hr, ax_hr = plt.subplots(figsize=(6, 4))
     fig_hr.patch.set_facecolor("#fafafa")
     ax_hr.set_facecolor("#ffffff")
     canvas_hr = FigureCanvasTkAgg(fig_hr, master=frame_hr)
     canvas_hr.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    def redraw_hr():
+        # HR залежать лише від моделі, а не від обраного елемента
+        ax_hr.clear()
+        if not summary.empty:
+            ax_hr.barh(hr_sorted.index, hr_sorted.values, color=hr_colors)
+            ax_hr.set_title("Hazard Ratios")
+            ax_hr.set_xlabel("HR")
+        else:
+            ax_hr.text(0.5, 0.5, "Немає коефіцієнтів", ha="center", va="center")
+        request_render(frame_hr)
+
     fig_ch, ax_ch = plt.subplots(figsize=(6, 4))
     fig_ch.patch.set_facecolor("#fafafa")
     ax_ch.set_facecolor("#ffffff")
     canvas_ch = FigureCanvasTkAgg(fig_ch, master=frame_ch)
     canvas_ch.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    ax_ch.set_xlabel("Час")
+    ax_ch.set_ylabel("Кумулятивний ризик")
+    ax_ch.title.set_animated(True)
+    ch_line, = ax_ch.plot([], [], linewidth=2, color="purple", animated=True)
+    blit_ch = make_blitter(canvas_ch, lambda: [ch_line, ax_ch.title])
+
     group_controls = ttk.Frame(frame_groups)
     group_controls.pack(pady=5)
 
@@ -221,15 +388,87 @@ def run_dashboard():
     ttk.Label(group_controls, text="Групувати за змінною:").pack(side=tk.LEFT, padx=5)
     group_menu = ttk.Combobox(group_controls, textvariable=group_var, values=groupable_vars, state="readonly")
     group_menu.pack(side=tk.LEFT, padx=5)
+    # Нова змінна групування малюється одразу (криві беруться з km_cache)
+    group_menu.bind("<<ComboboxSelected>>", lambda event: request_render(frame_groups))
 
     fig_groups, ax_groups = plt.subplots(figsize=(6, 4))
     canvas_groups = FigureCanvasTkAgg(fig_groups, master=frame_groups)
     canvas_groups.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    def draw_groups():
+        ax_groups.clear()
+        var = group_var.get()
+
+
+        if var not in df.columns:
+            if groupable_vars:
+                var = groupable_vars[0]
+                group_var.set(var)
+            else:
+                ax_groups.text(0.5, 0.5, "Немає змінних для групування", ha="center", va="center")
+                canvas_groups.draw_idle()
+                return
+
+        # Криві KM залежать лише від даних і змінної групування — рахуємо один раз
+        curves = km_cache.get(var)
+        if curves is None:
+            curves = km_cache[var] = km_group_curves(df, var)
+        for label, timeline, surv_vals in curves:
+            ax_groups.plot(timeline, surv_vals, drawstyle="steps-post", label=label)
+
+        ax_groups.set_title(f"Крива виживаності по групах ({var})")
+        ax_groups.set_xlabel("Час")
+        ax_groups.set_ylabel("Ймовірність виживання")
+        ax_groups.legend()
+        canvas_groups.draw_idle()
+
+    # Малюється лише видима вкладка; решта позначаються і рендеряться при переході на них
+    tab_renderers = {
+        str(frame_surv): lambda: refresh_axes(canvas_surv, ax_surv, blit_surv),
+        str(frame_hr): canvas_hr.draw_idle,
+        str(frame_ch): lambda: refresh_axes(canvas_ch, ax_ch, blit_ch),
+        str(frame_groups): draw_groups,
+    }
+    dirty_tabs = set()
+
+    def request_render(frame):
+        key = str(frame)
+        if str(notebook.select()) == key:
+            dirty_tabs.discard(key)
+            tab_renderers[key]()
+        else:
+            dirty_tabs.add(key)
+
+    def on_tab_changed(event=None):
+        key = str(notebook.select())
+        if key in dirty_tabs:
+            dirty_tabs.discard(key)
+            tab_renderers[key]()
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+
     report_text = tk.Text(root, height=16, wrap="word", font=("Arial", 11))
     report_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+    shown_idx = 0
+
+    def fill_details(idx):
+        try:
+            details_text.delete("1.0", tk.END)
+
+            row_series = df.iloc[idx]
+            # Один insert замість окремого виклику Tk на кожну колонку
+            text = "Повні дані елемента:\n" + "".join(f"  {k}: {v}\n" for k, v in row_series.items())
+
+            if ("тип" not in df.columns) or (not str(row_series.get("тип")).strip()):
+                power = pd.to_numeric(row_series.get("потужність_мвт"), errors="coerce")
+                inferred = infer_types_by_power(np.array([power], dtype=np.float64))[0]
+                text += f"\nІнтерпретація типу: {inferred}\n"
+            details_text.insert(tk.END, text)
+        except Exception:
+            pass
+
     def update_dashboard():
+        nonlocal shown_idx
 
         try:
             idx = int(obj_var.get())
@@ -241,7 +480,8 @@ def run_dashboard():
             messagebox.showerror("Помилка", f"Немає елемента мережі з індексом {idx}")
             return
 
-        row = df.iloc[[idx]][FEATURE_COLUMNS]
+        shown_idx = idx
+        row_df.iloc[0] = feature_arr[idx]
 
 
         try:
@@ -253,87 +493,28 @@ def run_dashboard():
             pass
 
 
-        surv = cph.predict_survival_function(row)
-        ax_surv.clear()
-        yvals = surv.values.flatten()
-        ax_surv.plot(surv.index, yvals, linewidth=2, color="blue", label="Ймовірність виживання")
-
-        try:
-            mask = yvals <= 0.5
-            if mask.any():
-                t50 = surv.index[np.argmax(mask)] 
-                ax_surv.axvline(t50, color="red", linestyle="--", label=f"Медіана ≈ {t50:.0f}")
-        except Exception:
-            pass
-        ax_surv.set_title(f"Крива виживаності для елемента #{idx}")
-        ax_surv.set_xlabel("Час")
-        ax_surv.set_ylabel("Ймовірність")
-        ax_surv.legend()
-        canvas_surv.draw()
-
+        pred = pred_cache.get(idx)
+        if pred is None:
+            pred = pred_cache[idx] = predict_element(cph, row_df)
+        surv_t, yvals, ch_t, ch_vals, risk_score, t50 = pred
 
-        ax_hr.clear()
-        summary = cph.summary
-        if not summary.empty:
-            hr = summary["exp(coef)"].sort_values()
-            colors = ["red" if v > 1 else "green" for v in hr.values]
-            ax_hr.barh(hr.index, hr.values, color=colors)
-            ax_hr.set_title("Hazard Ratios")
-            ax_hr.set_xlabel("HR")
+        surv_line.set_data(surv_t, yvals)
+        if t50 is not None:
+            median_vline.set_xdata([t50, t50])
+            median_vline.set_label(f"Медіана ≈ {t50:.0f}")
+            median_vline.set_visible(True)
         else:
-            ax_hr.text(0.5, 0.5, "Немає коефіцієнтів", ha="center", va="center")
-        canvas_hr.draw()
+            median_vline.set_label("_nolegend_")
+            median_vline.set_visible(False)
+        ax_surv.set_title(f"Крива виживаності для елемента #{idx}")
+        ax_surv.legend().set_animated(True)
+        request_render(frame_surv)
 
 
-        ch = cph.predict_cumulative_hazard(row)
-        ax_ch.clear()
-        ax_ch.plot(ch.index, ch.values.flatten(), linewidth=2, color="purple")
+        ch_line.set_data(ch_t, ch_vals)
         ax_ch.set_title(f"Кумулятивний ризик для елемента #{idx}")
-        ax_ch.set_xlabel("Час")
-        ax_ch.set_ylabel("Кумулятивний ризик")
-        canvas_ch.draw()
-
-
-        ax_groups.clear()
-        kmf = KaplanMeierFitter()
-        var = group_var.get()
-
-
-        if var not in df.columns:
-            if groupable_vars:
-                var = groupable_vars[0]
-                group_var.set(var)
-            else:
-                ax_groups.text(0.5, 0.5, "Немає змінних для групування", ha="center", va="center")
-                canvas_groups.draw()
-                return
-
-        unique_vals = df[var].nunique()
-
-        if pd.api.types.is_numeric_dtype(df[var]) and unique_vals > 3:
-            df["_group"] = pd.qcut(df[var], q=3,
-                                   labels=["Низьке", "Середнє", "Високе"],
-                                   duplicates="drop")
-        else:
-
-            df["_group"] = df[var].astype(str)
-
-        for val in sorted(df["_group"].unique()):
-            mask = df["_group"] == val
-            if mask.sum() == 0:
-                continue
-            kmf.fit(df.loc[mask, DURATION_COL],
-                    event_observed=df.loc[mask, EVENT_COL])
-            kmf.plot_survival_function(ax=ax_groups, label=f"{var}={val}")
-
-        ax_groups.set_title(f"Крива виживаності по групах ({var})")
-        ax_groups.set_xlabel("Час")
-        ax_groups.set_ylabel("Ймовірність виживання")
-        ax_groups.legend()
-        canvas_groups.draw()
-
+        request_render(frame_ch)
 
-        risk_score = float(cph.predict_partial_hazard(row).values[0])
 
         if risk_score < 0.8:
             risk_label.config(text="🟢 Низьке навантаження", foreground="green")
@@ -344,10 +525,9 @@ def run_dashboard():
 
 
         try:
-            curr_load = float(row["навантаження_мвт"].values[0])
-            min_load, max_load = float(df["навантаження_мвт"].min()), float(df["навантаження_мвт"].max())
-            if max_load > min_load:
-                pct = (curr_load - min_load) / (max_load - min_load) * 100
+            curr_load = float(feature_arr[idx, LOAD_COL_IDX])
+            if load_max > load_min:
+                pct = (curr_load - load_min) / (load_max - load_min) * 100
             else:
                 pct = 0.0
             pct = max(0.0, min(100.0, pct))
@@ -369,64 +549,67 @@ def run_dashboard():
             if "тип" in df.columns:
                 info_parts.insert(1, f"({df.iloc[idx]['тип']})")
             # Явно беремо значення з однорядкового DataFrame через .iloc[0]
-            if "навантаження_мвт" in row.columns:
-                val = float(row["навантаження_мвт"].iloc[0])
+            if "навантаження_мвт" in row_df.columns:
+                val = float(row_df["навантаження_мвт"].iloc[0])
                 info_parts.append(f"Навантаження: {val:.0f} МВт")
-            if "потужність_мвт" in row.columns:
-                val = float(row["потужність_мвт"].iloc[0])
+            if "потужність_мвт" in row_df.columns:
+                val = float(row_df["потужність_мвт"].iloc[0])
                 info_parts.append(f"Потужність: {val:.0f} МВт")
-            if "завантаженість" in row.columns:
-                val = float(row["завантаженість"].iloc[0])
+            if "завантаженість" in row_df.columns:
+                val = float(row_df["завантаженість"].iloc[0])
                 info_parts.append(f"Завантаженість: {val:.2f}")
             record_summary_label.config(text="  • ".join(info_parts) if info_parts else "Елемент: —")
         except Exception:
             record_summary_label.config(text="Елемент: —")
 
 
-        try:
-            details_text.delete("1.0", tk.END)
-  
-            full_row = df.iloc[idx].to_dict()
-            details_text.insert(tk.END, "Повні дані елемента:\n")
-            for k, v in full_row.items():
-                details_text.insert(tk.END, f"  {k}: {v}\n")
-
-            if ("тип" not in df.columns) or (not str(full_row.get("тип")).strip()):
-                inferred = infer_type_row(full_row) if 'infer_type_row' in globals() else "Н/д"
-                details_text.insert(tk.END, f"\nІнтерпретація типу: {inferred}\n")
-        except Exception:
-            pass
+        # Прихована панель деталей заповнюється при відкритті (toggle_details)
+        if show_details.get():
+            fill_details(idx)
 
         report_text.delete("1.0", tk.END)
         if not summary.empty:
-            report_text.insert(tk.END, "📊 Звіт моніторингу завантаженості (модель Кокса)\n\n")
-            sorted_summary = summary.reindex(
-                summary["exp(coef)"].sub(1).abs().sort_values(ascending=False).index
+            report_text.insert(
+                tk.END,
+                report_body
+                + f"Індивідуальний стан навантаження елемента #{idx}: {risk_label.cget('text')}\n"
             )
-            for feature, row_sum in sorted_summary.iterrows():
-                hr_val = row_sum["exp(coef)"]
-                ci_low = row_sum["exp(coef) lower 95%"]
-                ci_high = row_sum["exp(coef) upper 95%"]
-                percent = (hr_val - 1) * 100
-                if hr_val > 1.1:
-                    effect = f"підвищує ризик приблизно на {percent:.1f}%"
-                elif hr_val < 0.9:
-                    effect = f"знижує ризик приблизно на {abs(percent):.1f}%"
-                else:
-                    effect = "майже не впливає на ризик"
-                report_text.insert(
-                    tk.END,
-                    f"• {feature}: {effect} (HR={hr_val:.2f}, CI {ci_low:.2f}–{ci_high:.2f})\n"
-                )
-            report_text.insert(tk.END, f"\nНайбільший вплив має: {sorted_summary.index[0]}\n")
-            report_text.insert(tk.END, f"Індивідуальний стан навантаження елемента #{idx}: {risk_label.cget('text')}\n")
         else:
             report_text.insert(tk.END, "⚠️ Немає коефіцієнтів для формування звіту")
 
+    pending_update = None
+
+    def run_scheduled_update():
+        nonlocal pending_update
+        pending_update = None
+        # Під час набору в полі може бути порожнє чи неповне значення — чекаємо далі
+        try:
+            idx = int(obj_var.get())
+        except (tk.TclError, ValueError):
+            return
+        if 0 <= idx < len(df):
+            update_dashboard()
+
+    def schedule_update(event=None):
+        # Серія натискань стрілок/клавіш дає лише одне оновлення через 150 мс
+        nonlocal pending_update
+        if pending_update is not None:
+            root.after_cancel(pending_update)
+        pending_update = root.after(150, run_scheduled_update)
+
+    spin.config(command=schedule_update)
+    spin.bind("<KeyRelease>", schedule_update)
+
     def regenerate_data():
-        nonlocal df, cph, source_label, groupable_vars
+        nonlocal df, cph, source_label, groupable_vars, feature_arr
+        nonlocal summary, hr_sorted, hr_colors, report_body
         df = generate_random_data(150)
-        cph = train_cox_model(df.copy())
+        feature_arr = feature_matrix(df)
+        cph = train_cox_model(df, feature_arr)
+        summary, hr_sorted, hr_colors, report_body = summarize_cox_model(cph)
+        pred_cache.clear()
+        km_cache.clear()
+        redraw_hr()
         obj_var.set(0)
         source_label = "випадкові дані"
         title.config(text=f"Система моніторингу завантаженості енергосистеми ({source_label})")
@@ -436,22 +619,21 @@ def run_dashboard():
         group_menu["values"] = groupable_vars
         if groupable_vars:
             group_var.set(groupable_vars[0])
+        # Криві по групах не залежать від елемента — перебудова лише для нових даних
+        request_render(frame_groups)
 
+        refresh_df_cache()
         try:
-            if "ід" in df.columns:
-                new_ids = df["ід"].astype(str).tolist()
-            else:
-                new_ids = [str(i) for i in range(len(df))]
-            id_menu["values"] = new_ids
-            if new_ids:
-                id_var.set(new_ids[0])
+            id_menu["values"] = id_list
+            if id_list:
+                id_var.set(id_list[0])
         except Exception:
             pass
 
         if "назва" not in df.columns:
-            df["назва"] = df["ід"].astype(str).apply(lambda x: f"Елемент-{x}")
+            df["назва"] = element_names(df["ід"].to_numpy())
         if "тип" not in df.columns:
-            df["тип"] = df["потужність_мвт"].apply(lambda p: ("Генератор" if p>6000 else ("Підстанція" if p>5200 else "Лінія")))
+            df["тип"] = infer_types_by_power(df["потужність_мвт"].to_numpy())
         spin.config(to=max(0, len(df)-1))
         update_dashboard()
 
@@ -468,6 +650,7 @@ def run_dashboard():
             show_details.set(False)
             details_btn.config(text="Показати деталі")
         else:
+            fill_details(shown_idx)
             details_frame.pack(fill=tk.BOTH, expand=False, padx=10, pady=5)
             show_details.set(True)
             details_btn.config(text="Сховати деталі")
@@ -478,6 +661,8 @@ def run_dashboard():
     details_text = tk.Text(details_frame, height=6, wrap="word", font=("Segoe UI", 10))
     details_text.pack(fill=tk.BOTH, expand=True)
 
+    redraw_hr()
+    request_render(frame_groups)
     update_dashboard()
     root.mainloop()
 